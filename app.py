@@ -1,10 +1,23 @@
 import streamlit as st
+from streamlit import runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+import asyncio
+import threading
+import queue
+import atexit
+import weakref
+import ctypes
 import subprocess
 import re
 import time
+import uuid
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
 from datetime import datetime
+from collections import deque
+from dataclasses import dataclass
 from groq import Groq
 import plotly.express as px
 import plotly.graph_objects as go
@@ -15,9 +28,6 @@ import os
 # CONFIGURAÇÃO INICIAL
 # ============================================================================
 
-# Carrega variáveis de ambiente do arquivo .env
-load_dotenv()
-
 # Configuração da página do Streamlit
 st.set_page_config(
     page_title="Sistema de Monitoramento de Fading Wi-Fi",
@@ -25,16 +35,224 @@ st.set_page_config(
     initial_sidebar_state="expanded"  
 )
 
+
+@dataclass(frozen=True)
+class AppConfig:
+    """Configurações carregadas do arquivo .env."""
+    groq_api_key: str
+    modelo_ai: str
+
+
+@st.cache_resource
+def load_config():
+    """
+    Carrega variáveis de ambiente do arquivo .env uma única vez.
+    
+    O resultado fica em cache (cache_resource), evitando ler o arquivo
+    .env novamente a cada rerun do Streamlit.
+    
+    Retorna:
+        AppConfig: Configurações da aplicação
+    """
+    load_dotenv()
+    return AppConfig(
+        groq_api_key=os.getenv("GROQ_API_KEY"),
+        modelo_ai=os.getenv("MODELO_AI", "llama-3.1-8b-instant")  # Valor padrão se não estiver no .env
+    )
+
+
 # Credenciais da API Groq carregadas do arquivo .env
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-MODELO_AI = os.getenv("MODELO_AI", "llama-3.1-8b-instant")  # Valor padrão se não estiver no .env
+CONFIG = load_config()
+GROQ_API_KEY = CONFIG.groq_api_key
+MODELO_AI = CONFIG.modelo_ai
 
 FAST_FADING_THRESHOLD = 10              # Variação mínima em dBm para Fast Fading
 MODERATE_VARIATION_THRESHOLD = 6        # Variação mínima em dBm para Variação Moderada
 SLOW_FADING_THRESHOLD = 8               # Queda total mínima em dBm para Slow Fading
 MULTIPATH_OSCILLATION_COUNT = 3         # Número mínimo de oscilações para Multipath
 MULTIPATH_OSCILLATION_THRESHOLD = 5     # Variação mínima por oscilação em dBm
+JANELA_DETECCAO = 5                     # Número de amostras analisadas pelo detector (fixo: detector desenrolado)
+JANELA_ESTABILIDADE = 10                # Número de amostras do desvio padrão móvel
+CAPACIDADE_BUFFER = 10_000              # Número máximo de amostras mantidas em memória
+HISTORICO_EVENTOS = 15                  # Número de eventos exibidos no histórico
+CONTEXTO_IA_AMOSTRAS = 40               # Número de amostras de RSSI enviadas à IA
+MAX_TOKENS_IA = 512                     # Limite de tokens da resposta da IA
+EVENTOS_ANALISE_LOTE = 5                # Eventos analisados em paralelo pelo botão da sidebar
+TAMANHO_FILA_EVENTOS = 128              # Eventos aguardando processamento pela interface
+INTERVALO_ATUALIZACAO_TELA = 2.0        # Segundos entre atualizações da tela (independente da coleta)
+DIRETORIO_SESSOES = "sessoes"           # Diretório dos arquivos Parquet com o histórico completo
+LOTE_ARQUIVO = 20                       # Amostras acumuladas por gravação no Parquet
+INTERVALO_MAXIMO_ARQUIVO = 5.0          # Segundos máximos entre gravações no Parquet
+ESPERA_ENCERRAMENTO = 5.0               # Segundos aguardados por thread de coleta ao encerrar o processo
+PONTOS_GRAFICO = 2000                   # Máximo de pontos enviados ao navegador por série
+
+# Expressão regular (pré-compilada) para a saída do 'netsh wlan show interfaces'
+# Uma única alternação com grupos nomeados: a saída é percorrida uma só vez
+# Padrão em bytes: a saída do netsh é analisada sem decodificação
+REGEX_NETSH = re.compile(
+    rb"(?:Sinal|Signal)\s*:\s*(?P<sinal>\d+)%"
+    rb"|(?:Canal|Channel)\s*:\s*(?P<canal>\d+)"
+    rb"|(?:Radio type|Tipo de r.dio)\s*:\s*(?P<radio>.+)"
+)
+
+# Bandas de frequência Wi-Fi (índice = código armazenado no buffer)
+FREQUENCIAS = ("2.4 GHz", "5 GHz")
+
+# Tipos de evento indexados pelo código retornado por FadingDetector.classify
+EVENTOS_FADING = (
+    None,
+    "Fast Fading",
+    "Slow Fading / Shadowing",
+    "Multipath Fading",
+    "Variacao Moderada"
+)
+
+# Cor de cada tipo de evento na linha do tempo
+CORES_EVENTOS = {
+    'Fast Fading': '#e74c3c',               # Vermelho
+    'Slow Fading / Shadowing': '#f39c12',   # Laranja
+    'Multipath Fading': '#9b59b6',          # Roxo
+    'Variacao Moderada': '#3498db'          # Azul
+}
+
+# Cor de cada nível de qualidade no gráfico de pizza
+CORES_QUALIDADE = {
+    'Excelente': '#2ecc71',                 # Verde
+    'Bom': '#3498db',                       # Azul
+    'Regular': '#f39c12',                   # Laranja
+    'Fraco': '#e74c3c'                      # Vermelho
+}
+
+# Layouts fixos dos gráficos (montados uma única vez)
+# uirevision constante: o Plotly preserva zoom, pan e legenda entre atualizações
+LEGENDA_HORIZONTAL = dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+
+LAYOUT_RSSI = dict(
+    xaxis_title="Tempo",
+    yaxis_title="RSSI (dBm)",
+    height=400,
+    hovermode='x unified',
+    showlegend=True,
+    legend=LEGENDA_HORIZONTAL,
+    uirevision=True
+)
+
+LAYOUT_ESTABILIDADE = dict(
+    xaxis_title="Tempo",
+    yaxis_title="Desvio Padrao (dBm)",
+    height=300,
+    showlegend=False,
+    uirevision=True
+)
+
+LAYOUT_QUALIDADE = dict(
+    height=300,
+    showlegend=True,
+    legend=dict(orientation="h", yanchor="bottom", y=-0.2, xanchor="center", x=0.5),
+    uirevision=True
+)
+
+LAYOUT_LINHA_TEMPO = dict(
+    xaxis_title="Amostra",
+    yaxis_title="Tipo de Evento",
+    height=250,
+    showlegend=True,
+    legend=LEGENDA_HORIZONTAL,
+    uirevision=True
+)
+
+
+# ============================================================================
+# WLAN API DO WINDOWS (ctypes)
+# ============================================================================
+
+WLAN_CLIENT_VERSION = 2                 # Versão do cliente WLAN (Vista ou superior)
+WLAN_INTERFACE_STATE_CONNECTED = 1      # wlan_interface_state_connected
+WLAN_INTF_OPCODE_CHANNEL_NUMBER = 8     # wlan_intf_opcode_channel_number
+WLAN_INTF_OPCODE_RSSI = 0x10000102      # wlan_intf_opcode_rssi
+
+
+class GUID(ctypes.Structure):
+    """Estrutura GUID do Windows (identificador da interface Wi-Fi)."""
+    _fields_ = [
+        ('Data1', ctypes.c_uint32),
+        ('Data2', ctypes.c_uint16),
+        ('Data3', ctypes.c_uint16),
+        ('Data4', ctypes.c_ubyte * 8)
+    ]
+
+
+class WLAN_INTERFACE_INFO(ctypes.Structure):
+    """Estrutura WLAN_INTERFACE_INFO retornada por WlanEnumInterfaces."""
+    _fields_ = [
+        ('InterfaceGuid', GUID),
+        ('strInterfaceDescription', ctypes.c_wchar * 256),
+        ('isState', ctypes.c_int)
+    ]
+
+
+class WLAN_INTERFACE_INFO_LIST(ctypes.Structure):
+    """Estrutura WLAN_INTERFACE_INFO_LIST (array de tamanho variável)."""
+    _fields_ = [
+        ('dwNumberOfItems', ctypes.c_uint32),
+        ('dwIndex', ctypes.c_uint32),
+        ('InterfaceInfo', WLAN_INTERFACE_INFO * 1)
+    ]
+
 
+@st.cache_resource
+def get_wlan_handle():
+    """
+    Abre um handle para a WLAN API do Windows (wlanapi.dll).
+    
+    O handle é aberto uma única vez (cache_resource) e reaproveitado em
+    todas as coletas e reruns do Streamlit.
+    
+    Retorna:
+        tuple: (wlanapi, handle), ou None se a API não estiver disponível
+    """
+    try:
+        wlanapi = ctypes.WinDLL("wlanapi.dll")
+    except (AttributeError, OSError):
+        # Fora do Windows ou sem serviço WLAN
+        return None
+    
+    versao_negociada = ctypes.c_uint32()
+    handle = ctypes.c_void_p()
+    resultado = wlanapi.WlanOpenHandle(
+        WLAN_CLIENT_VERSION, None, ctypes.byref(versao_negociada), ctypes.byref(handle)
+    )
+    if resultado != 0:
+        return None
+    
+    return wlanapi, handle
+
+
+def wlan_query_interface(wlanapi, handle, guid, opcode):
+    """
+    Consulta um valor inteiro de uma interface via WlanQueryInterface.
+    
+    Args:
+        wlanapi: Biblioteca wlanapi.dll carregada
+        handle: Handle aberto por WlanOpenHandle
+        guid: GUID da interface Wi-Fi
+        opcode: Código WLAN_INTF_OPCODE a consultar
+        
+    Retorna:
+        int: Valor retornado pela API, ou None se falhar
+    """
+    tamanho = ctypes.c_uint32()
+    dados = ctypes.c_void_p()
+    resultado = wlanapi.WlanQueryInterface(
+        handle, ctypes.byref(guid), opcode, None,
+        ctypes.byref(tamanho), ctypes.byref(dados), None
+    )
+    if resultado != 0:
+        return None
+    
+    valor = ctypes.cast(dados, ctypes.POINTER(ctypes.c_long)).contents.value
+    wlanapi.WlanFreeMemory(dados)
+    return valor
 
 
 # ============================================================================
@@ -44,11 +262,109 @@ MULTIPATH_OSCILLATION_THRESHOLD = 5     # Variação mínima por oscilação em
 class WiFiDataCollector:
     """Gerencia a coleta de dados Wi-Fi do sistema Windows."""
     
-    @staticmethod
-    def get_wifi_info():
+    def __init__(self):
+        """
+        Inicializa o coletor obtendo o handle da WLAN API (se disponível).
+        
+        O handle é obtido aqui, na thread do Streamlit, para que
+        get_wifi_info possa ser chamado também a partir de outras threads.
+        """
+        self.wlan = get_wlan_handle()
+        # GUID da interface conectada, reaproveitado entre coletas
+        self.interface_guid = None
+    
+    def get_wifi_info(self):
         """
         Coleta informações do sinal Wi-Fi incluindo RSSI, canal e frequência.
         
+        Usa a WLAN API do Windows quando disponível; caso contrário,
+        recorre ao comando netsh.
+        
+        Retorna:
+            dict: Dicionário contendo rssi, canal e frequencia, ou None se falhar.
+        """
+        if self.wlan is not None:
+            return self.get_wifi_info_wlanapi()
+        return self.get_wifi_info_netsh()
+    
+    def find_connected_interface(self):
+        """
+        Enumera as interfaces Wi-Fi e localiza a interface conectada.
+        
+        Retorna:
+            GUID: Cópia do GUID da interface conectada, ou None se nenhuma
+        """
+        wlanapi, handle = self.wlan
+        lista = ctypes.POINTER(WLAN_INTERFACE_INFO_LIST)()
+        if wlanapi.WlanEnumInterfaces(handle, None, ctypes.byref(lista)) != 0:
+            return None
+        
+        try:
+            # InterfaceInfo é um array de tamanho variável (dwNumberOfItems)
+            total = lista.contents.dwNumberOfItems
+            interfaces = (WLAN_INTERFACE_INFO * total).from_address(
+                ctypes.addressof(lista.contents.InterfaceInfo)
+            )
+            for interface in interfaces:
+                if interface.isState == WLAN_INTERFACE_STATE_CONNECTED:
+                    # Copia o GUID antes de liberar a memória da lista
+                    return GUID.from_buffer_copy(interface.InterfaceGuid)
+            return None
+        finally:
+            wlanapi.WlanFreeMemory(lista)
+    
+    def get_wifi_info_wlanapi(self):
+        """
+        Coleta RSSI e canal diretamente da WLAN API, sem criar processos.
+        
+        Funcionamento:
+        1. Localiza a interface conectada (apenas na primeira coleta ou
+           depois que a interface anterior deixou de responder)
+        2. Consulta RSSI (já em dBm) com wlan_intf_opcode_rssi
+        3. Consulta número do canal com wlan_intf_opcode_channel_number
+        4. Determina frequência (2.4 ou 5 GHz) pelo número do canal
+        
+        Retorna:
+            dict: Dicionário contendo rssi, canal e frequencia, ou None se falhar.
+        """
+        wlanapi, handle = self.wlan
+        
+        try:
+            # O coletor é compartilhado entre as threads de coleta de todas as
+            # sessões: o GUID é lido uma única vez em variável local, pois outra
+            # thread pode redefini-lo para None entre a verificação e o uso
+            interface_guid = self.interface_guid
+            if interface_guid is None:
+                interface_guid = self.find_connected_interface()
+                if interface_guid is None:
+                    return None
+                self.interface_guid = interface_guid
+            
+            rssi = wlan_query_interface(
+                wlanapi, handle, interface_guid, WLAN_INTF_OPCODE_RSSI
+            )
+            if rssi is None:
+                # Interface desconectada ou removida: procura novamente na próxima coleta
+                self.interface_guid = None
+                return None
+            
+            canal = wlan_query_interface(
+                wlanapi, handle, interface_guid, WLAN_INTF_OPCODE_CHANNEL_NUMBER
+            )
+            
+            return {
+                'rssi': float(rssi),
+                'canal': canal,
+                'frequencia': "5 GHz" if canal and canal > 14 else "2.4 GHz"
+            }
+        except Exception as e:
+            return None
+    
+    @staticmethod
+    def get_wifi_info_netsh():
+        """
+        Coleta informações do sinal Wi-Fi via netsh (alternativa à WLAN API).
+        
         Funcionamento:
         1. Executa comando 'netsh wlan show interfaces' do Windows
         2. Extrai RSSI (força do sinal) convertendo de % para dBm
@@ -64,28 +380,31 @@ class WiFiDataCollector:
             startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
             
             # Executa comando netsh para obter informações da interface Wi-Fi
+            # (saída mantida em bytes; apenas os valores extraídos são convertidos)
             result = subprocess.check_output(
                 ["netsh", "wlan", "show", "interfaces"],
-                startupinfo=startupinfo,
-                encoding='cp850',  
-                errors='ignore'   
+                startupinfo=startupinfo
             )
             
-            # Extrai RSSI 
-            match_rssi = re.search(r"(Sinal|Signal)\s*:\s*(\d+)%", result)
-            # Converte de porcentagem (0-100) para dBm (-100 a -50)
-            rssi = (int(match_rssi.group(2)) / 2) - 100 if match_rssi else None
+            # Extrai sinal, canal e tipo de rádio em uma única passada
+            # (mantém a primeira ocorrência de cada campo)
+            campos = {}
+            for match in REGEX_NETSH.finditer(result):
+                campos.setdefault(match.lastgroup, match.group(match.lastgroup))
+                if len(campos) == 3:
+                    break
+            
+            # Converte RSSI de porcentagem (0-100) para dBm (-100 a -50)
+            rssi = (int(campos['sinal']) / 2) - 100 if 'sinal' in campos else None
             
-            # Extrai Canal Wi-Fi
-            match_canal = re.search(r"(Canal|Channel)\s*:\s*(\d+)", result)
-            canal = int(match_canal.group(2)) if match_canal else None
+            # Canal Wi-Fi
+            canal = int(campos['canal']) if 'canal' in campos else None
             
-            # Extrai tipo de rádio 
-            match_radio = re.search(r"(Radio type|Tipo de r.dio)\s*:\s*(.+)", result)
-            radio_type = match_radio.group(2).strip() if match_radio else ""
+            # Tipo de rádio 
+            radio_type = campos.get('radio', b"").strip()
             
             # Determina frequência baseado no tipo de rádio ou número do canal
-            if "802.11a" in radio_type or "802.11ac" in radio_type or "802.11ax" in radio_type:
+            if b"802.11a" in radio_type or b"802.11ac" in radio_type or b"802.11ax" in radio_type:
                 frequencia = "5 GHz"
             elif canal and canal > 14:
                 frequencia = "5 GHz"
@@ -101,6 +420,20 @@ class WiFiDataCollector:
             return None
 
 
+@st.cache_resource
+def get_collector():
+    """
+    Cria o coletor Wi-Fi uma única vez por processo.
+    
+    O coletor compartilha o handle da WLAN API e mantém em cache a
+    interface conectada, então não há por que recriá-lo por sessão.
+    
+    Retorna:
+        WiFiDataCollector: Coletor compartilhado
+    """
+    return WiFiDataCollector()
+
+
 # ============================================================================
 # CLASSE: DETECTOR DE FADING
 # ============================================================================
@@ -109,77 +442,889 @@ class FadingDetector:
     """Detecta diferentes tipos de padrões de fading em sinais Wi-Fi."""
     
     @staticmethod
-    def detect_fading(novo_rssi, historico):
+    def classify(novo_rssi, janela, total_amostras):
         """
-        Analisa histórico de sinal para detectar padrões de fading.
+        Classifica o padrão de fading em uma única passada pela janela.
         
         Funcionamento:
         1. Verifica se há amostras suficientes (mínimo 5)
         2. Testa Fast Fading (variação brusca)
-        3. Testa Slow Fading (queda contínua)
-        4. Testa Multipath Fading (oscilações repetitivas)
-        5. Testa Variação Moderada
+        3. Calcula as 4 diferenças entre amostras consecutivas,
+           usadas tanto na verificação de queda quanto nas oscilações
+        4. Testa Slow Fading (queda contínua)
+        5. Testa Multipath Fading (oscilações repetitivas)
+        6. Testa Variação Moderada
         
         Args:
             novo_rssi: Valor RSSI atual
-            historico: DataFrame com dados históricos de RSSI
+            janela: Array float64 circular com as últimas amostras de RSSI
+            total_amostras: Total de amostras já escritas na janela
             
         Retorna:
-            str: Tipo de fading detectado, ou None se nenhum
+            int: Código do evento (índice em EVENTOS_FADING), 0 se nenhum
         """
         # Precisa de pelo menos 5 amostras para análise confiável
-        if len(historico) < 5:
-            return None
+        if total_amostras < JANELA_DETECCAO:
+            return 0
         
-        # Pega as últimas 5 amostras para análise
-        ultimos_5 = historico['rssi'].tail(5).tolist()
+        # Reordena a janela circular da amostra mais antiga (b0) para a mais recente (b4)
+        # Especializado para janela de 5 amostras: comparações desenroladas
+        valores = janela.tolist()
+        inicio = total_amostras % JANELA_DETECCAO
+        b0, b1, b2, b3, b4 = valores[inicio:] + valores[:inicio]
+        primeiro = b0
+        ultimo = b4
         
         # Calcula variação absoluta entre amostra atual e anterior
-        delta_atual = abs(novo_rssi - ultimos_5[-1])
+        delta_atual = abs(novo_rssi - ultimo)
         
         # TESTE 1: Fast Fading - Variação brusca e grande
         # Exemplo: sinal muda de -50 para -60 dBm (10 dBm de diferença)
         if delta_atual >= FAST_FADING_THRESHOLD:
-            return "Fast Fading"
+            return 1
+        
+        # Diferenças entre amostras consecutivas, calculadas uma única vez
+        # - Queda contínua: todas as amostras em queda (ou estáveis)
+        #   Ex: [-50, -52, -54, -56, -58] = queda contínua
+        # - Oscilações: variações significativas entre amostras consecutivas
+        #   Ex: [-50, -55, -51, -56, -52] = 4 oscilações
+        d0 = b1 - b0
+        d1 = b2 - b1
+        d2 = b3 - b2
+        d3 = b4 - b3
+        is_declining = d0 <= 0 and d1 <= 0 and d2 <= 0 and d3 <= 0
+        oscilacoes = (
+            (abs(d0) >= MULTIPATH_OSCILLATION_THRESHOLD)
+            + (abs(d1) >= MULTIPATH_OSCILLATION_THRESHOLD)
+            + (abs(d2) >= MULTIPATH_OSCILLATION_THRESHOLD)
+            + (abs(d3) >= MULTIPATH_OSCILLATION_THRESHOLD)
+        )
         
         # TESTE 2: Slow Fading / Shadowing - Queda contínua
-        if len(ultimos_5) >= 5:
-            # Verifica se todas as amostras estão em queda (ou estáveis)
-            # Ex: [-50, -52, -54, -56, -58] = queda contínua
-            is_declining = all(ultimos_5[i] >= ultimos_5[i+1] for i in range(len(ultimos_5)-1))
-            
-            # Calcula queda total (primeira - última amostra)
-            queda_total = ultimos_5[0] - ultimos_5[-1]
-            
-            # Se está em queda contínua E a queda total é significativa
-            if is_declining and queda_total >= SLOW_FADING_THRESHOLD:
-                return "Slow Fading / Shadowing"
+        # Queda contínua E queda total (primeira - última amostra) significativa
+        if is_declining and primeiro - ultimo >= SLOW_FADING_THRESHOLD:
+            return 2
         
         # TESTE 3: Multipath Fading - Oscilações repetitivas
-        # Conta quantas vezes o sinal oscilou significativamente
-        # Ex: [-50, -55, -51, -56, -52] = 4 oscilações
-        oscilacoes = sum(
-            1 for i in range(len(ultimos_5)-1)
-            if abs(ultimos_5[i] - ultimos_5[i+1]) >= MULTIPATH_OSCILLATION_THRESHOLD
-        )
-        
         # Se houve 3 ou mais oscilações, é Multipath Fading
         if oscilacoes >= MULTIPATH_OSCILLATION_COUNT:
-            return "Multipath Fading"
+            return 3
         
         # TESTE 4: Variação Moderada - Mudança significativa mas não extrema
         # Entre 6 e 9 dBm de variação
         if delta_atual >= MODERATE_VARIATION_THRESHOLD:
-            return "Variacao Moderada"
+            return 4
         
         # Nenhum padrão de fading detectado
-        return None
+        return 0
+
+
+# ============================================================================
+# CLASSE: DESVIO PADRÃO MÓVEL
+# ============================================================================
+
+class OnlineRollingStd:
+    """
+    Calcula o desvio padrão móvel das últimas amostras de forma incremental.
+    
+    Mantém média e soma dos quadrados dos desvios (M2) da janela,
+    atualizadas pelo método de Welford a cada entrada/saída de amostra.
+    Cada atualização é O(1) e evita o cancelamento numérico da fórmula
+    soma dos quadrados - quadrado da soma.
+    """
+    
+    def __init__(self, janela=JANELA_ESTABILIDADE):
+        """
+        Inicializa o cálculo com a janela vazia.
+        
+        Args:
+            janela: Número de amostras consideradas no desvio padrão
+        """
+        self.valores = deque(maxlen=janela)
+        self.media = 0.0
+        self.m2 = 0.0
+    
+    def update(self, valor):
+        """
+        Adiciona uma amostra e retorna o desvio padrão atual da janela.
+        
+        Args:
+            valor: Novo valor RSSI em dBm
+            
+        Retorna:
+            float: Desvio padrão amostral (ddof=1), ou NaN com menos de 2 amostras
+        """
+        n = len(self.valores)
+        
+        if n < self.valores.maxlen:
+            # Janela ainda enchendo: apenas inclui o novo valor
+            delta = valor - self.media
+            self.media += delta / (n + 1)
+            self.m2 += delta * (valor - self.media)
+            n += 1
+        else:
+            # Janela cheia: substitui o valor mais antigo pelo novo
+            antigo = self.valores[0]
+            media_anterior = self.media
+            self.media += (valor - antigo) / n
+            self.m2 += (valor - antigo) * (valor - self.media + antigo - media_anterior)
+        
+        self.valores.append(valor)
+        
+        if n < 2:
+            return float('nan')
+        return (max(self.m2, 0.0) / (n - 1)) ** 0.5
+
+
+# ============================================================================
+# CLASSE: BUFFER CIRCULAR DE AMOSTRAS
+# ============================================================================
+
+class RSSIRingBuffer:
+    """
+    Armazena as amostras coletadas em arrays NumPy pré-alocados e tipados.
+    
+    Cada amostra é escrita em duas posições (i e i + capacidade), de modo que
+    as últimas amostras ficam sempre contíguas e em ordem cronológica. Assim
+    a leitura é uma única fatia dos arrays e a escrita é O(1).
+    
+    Colunas de texto (frequência e evento) são guardadas como códigos int8,
+    e o canal como int16 (-1 quando indisponível).
+    
+    Escrito pela thread de coleta e lido pela interface: todo acesso passa
+    pelo lock (reentrante, para que o WiFiSampler possa mantê-lo durante a
+    detecção e a escrita).
+    """
+    
+    COLUNAS = ('timestamp', 'rssi', 'desvio_movel', 'canal', 'frequencia', 'evento')
+    
+    # Tipos categóricos usados na leitura (os códigos int8 viram as categorias
+    # sem conversão para strings; evento 0 = nenhum vira código -1 = NaN)
+    TIPO_FREQUENCIA = pd.CategoricalDtype(FREQUENCIAS)
+    TIPO_EVENTO = pd.CategoricalDtype(EVENTOS_FADING[1:])
+    
+    def __init__(self, capacidade=CAPACIDADE_BUFFER):
+        """
+        Inicializa o buffer vazio.
+        
+        Args:
+            capacidade: Número máximo de amostras mantidas em memória
+        """
+        self.capacidade = capacidade
+        self.total = 0  # Total de amostras já escritas (inclui descartadas)
+        self.eventos = deque()  # Números sequenciais das amostras com evento
+        self.lock = threading.RLock()
+        self.reset_resumo()
+        self.colunas = {
+            'timestamp': np.empty(2 * capacidade, dtype=np.int64),
+            'rssi': np.empty(2 * capacidade, dtype=np.float32),
+            'desvio_movel': np.empty(2 * capacidade, dtype=np.float32),
+            'canal': np.empty(2 * capacidade, dtype=np.int16),
+            'frequencia': np.empty(2 * capacidade, dtype=np.int8),
+            'evento': np.empty(2 * capacidade, dtype=np.int8)
+        }
+    
+    def __len__(self):
+        """Número de amostras atualmente disponíveis no buffer."""
+        return min(self.total, self.capacidade)
+    
+    def reset_resumo(self):
+        """Zera a soma do RSSI e a última amostra usadas nas métricas."""
+        self.soma_rssi = 0.0
+        self.compensacao_rssi = 0.0  # Erro acumulado da soma (Kahan)
+        self.ultima_amostra = None
+    
+    def acumula_rssi(self, valor):
+        """
+        Soma um valor ao total de RSSI com compensação de Kahan.
+        
+        A soma é atualizada a cada amostra que entra e sai do buffer, então
+        a compensação evita que o erro de arredondamento cresça com o tempo.
+        
+        Args:
+            valor: Valor a somar (negativo para amostras descartadas)
+        """
+        y = valor - self.compensacao_rssi
+        t = self.soma_rssi + y
+        self.compensacao_rssi = (t - self.soma_rssi) - y
+        self.soma_rssi = t
+    
+    def clear(self):
+        """Descarta todas as amostras (os arrays pré-alocados são reaproveitados)."""
+        with self.lock:
+            self.total = 0
+            self.eventos.clear()
+            self.reset_resumo()
+    
+    def append(self, timestamp, rssi, desvio_movel, canal, frequencia, evento_codigo):
+        """
+        Adiciona uma amostra, descartando a mais antiga se o buffer estiver cheio.
+        
+        Args:
+            timestamp: Horário da coleta (nanossegundos desde epoch, time.time_ns)
+            rssi: Valor RSSI em dBm
+            desvio_movel: Desvio padrão móvel do RSSI (OnlineRollingStd)
+            canal: Número do canal Wi-Fi, ou None
+            frequencia: Banda de frequência Wi-Fi (um dos valores de FREQUENCIAS)
+            evento_codigo: Código do evento (índice em EVENTOS_FADING), 0 se nenhum
+        """
+        valores = (
+            timestamp,
+            rssi,
+            desvio_movel,
+            -1 if canal is None else canal,
+            FREQUENCIAS.index(frequencia),
+            evento_codigo
+        )
+        with self.lock:
+            pos = self.total % self.capacidade
+            rssi_coluna = self.colunas['rssi']
+            
+            # Retira da soma a amostra que será sobrescrita (buffer cheio)
+            if self.total >= self.capacidade:
+                self.acumula_rssi(-float(rssi_coluna[pos]))
+            
+            for nome, valor in zip(self.COLUNAS, valores):
+                coluna = self.colunas[nome]
+                coluna[pos] = valor
+                coluna[pos + self.capacidade] = valor
+            
+            # Soma o valor armazenado (float32), o mesmo que será retirado depois
+            self.acumula_rssi(float(rssi_coluna[pos]))
+            self.ultima_amostra = {'rssi': rssi, 'canal': canal, 'frequencia': frequencia}
+            
+            # Mantém a lista de eventos só com amostras ainda no buffer
+            if evento_codigo:
+                self.eventos.append(self.total)
+            while self.eventos and self.eventos[0] <= self.total - self.capacidade:
+                self.eventos.popleft()
+            self.total += 1
+    
+    def summary(self):
+        """
+        Retorna a última amostra e a média do RSSI sem percorrer o buffer.
+        
+        Retorna:
+            tuple: (dict da última amostra com rssi, canal e frequencia, média
+                do RSSI das amostras no buffer), ou (None, None) se vazio
+        """
+        with self.lock:
+            if self.total == 0:
+                return None, None
+            return self.ultima_amostra, self.soma_rssi / len(self)
+    
+    def event_positions(self, indice):
+        """
+        Retorna as posições das amostras com evento em um DataFrame do buffer.
+        
+        Usa a lista de eventos mantida na escrita, evitando percorrer a
+        coluna de eventos inteira (notna) a cada atualização da tela.
+        
+        Args:
+            indice: RangeIndex de um DataFrame retornado por to_dataframe() ou tail()
+            
+        Retorna:
+            np.ndarray: Posições (para iloc) dos eventos, em ordem cronológica
+        """
+        with self.lock:
+            seqs = np.fromiter(self.eventos, dtype=np.int64, count=len(self.eventos))
+        seqs = seqs[(seqs >= indice.start) & (seqs < indice.stop)]
+        return seqs - indice.start
+    
+    def tail_rssi(self, n):
+        """
+        Retorna os últimos n valores de RSSI, sem montar um DataFrame.
+        
+        Args:
+            n: Número máximo de amostras
+            
+        Retorna:
+            np.ndarray: Cópia dos valores de RSSI (float32), em ordem cronológica
+        """
+        with self.lock:
+            tamanho = len(self)
+            inicio = self.total % self.capacidade if self.total > self.capacidade else 0
+            fim = inicio + tamanho
+            return self.colunas['rssi'][max(inicio, fim - n):fim].copy()
+    
+    def rows(self, seqs):
+        """
+        Retorna apenas as amostras indicadas, sem copiar o buffer inteiro.
+        
+        Números sequenciais já descartados do buffer são ignorados.
+        
+        Args:
+            seqs: Números sequenciais das amostras, na ordem desejada
+            
+        Retorna:
+            pd.DataFrame: Amostras no mesmo formato de to_dataframe(),
+                indexadas pelo número sequencial
+        """
+        with self.lock:
+            primeiro = self.total - len(self)
+            seqs = np.array([seq for seq in seqs if primeiro <= seq < self.total], dtype=np.int64)
+            # A amostra seq fica na posição seq % capacidade (e na espelhada)
+            posicoes = seqs % self.capacidade
+            copia = {nome: coluna[posicoes] for nome, coluna in self.colunas.items()}
+        
+        return self.build_frame(copia, pd.Index(seqs))
+    
+    def tail(self, n):
+        """
+        Retorna as últimas n amostras, sem copiar o buffer inteiro.
+        
+        Args:
+            n: Número máximo de amostras
+            
+        Retorna:
+            pd.DataFrame: Amostras no mesmo formato de to_dataframe()
+        """
+        with self.lock:
+            total = self.total
+            primeiro = max(total - n, total - len(self))
+            posicoes = np.arange(primeiro, total) % self.capacidade
+            copia = {nome: coluna[posicoes] for nome, coluna in self.colunas.items()}
+        
+        return self.build_frame(copia, pd.RangeIndex(primeiro, total))
+    
+    def to_dataframe(self):
+        """
+        Retorna as amostras em ordem cronológica como DataFrame.
+        
+        A fatia é copiada sob o lock (uma cópia contígua por coluna), pois a
+        thread de coleta continua escrevendo enquanto a interface desenha.
+        O índice é o número sequencial da amostra desde o início da coleta,
+        estável mesmo depois que amostras antigas são descartadas. Usado
+        apenas onde todas as amostras são necessárias (gráficos e exportação);
+        para poucas amostras use tail(), tail_rssi() ou rows().
+        
+        Retorna:
+            pd.DataFrame: Amostras com colunas timestamp, rssi, desvio_movel, canal, frequencia e evento
+        """
+        with self.lock:
+            total = self.total
+            tamanho = len(self)
+            inicio = total % self.capacidade if total > self.capacidade else 0
+            fatia = slice(inicio, inicio + tamanho)
+            copia = {nome: coluna[fatia].copy() for nome, coluna in self.colunas.items()}
+        
+        return self.build_frame(copia, pd.RangeIndex(total - tamanho, total))
+    
+    def build_frame(self, copia, indice):
+        """
+        Monta o DataFrame a partir de cópias das colunas internas.
+        
+        Frequência e evento viram colunas categóricas construídas direto dos
+        códigos int8, sem criar um objeto string por linha.
+        
+        Args:
+            copia: Dicionário coluna -> array copiado do buffer
+            indice: Índice do DataFrame (números sequenciais das amostras)
+            
+        Retorna:
+            pd.DataFrame: Amostras com colunas timestamp, rssi, desvio_movel, canal, frequencia e evento
+        """
+        canal = copia['canal']
+        return pd.DataFrame(
+            {
+                'timestamp': copia['timestamp'],
+                'rssi': copia['rssi'],
+                'desvio_movel': copia['desvio_movel'],
+                # Int16 anulável: canal -1 vira <NA>
+                'canal': pd.arrays.IntegerArray(canal, canal < 0),
+                'frequencia': pd.Categorical.from_codes(copia['frequencia'], dtype=self.TIPO_FREQUENCIA),
+                'evento': pd.Categorical.from_codes(copia['evento'] - 1, dtype=self.TIPO_EVENTO)
+            },
+            index=indice,
+            copy=False
+        )
+
+
+# ============================================================================
+# CLASSE: ARQUIVAMENTO DA SESSÃO EM PARQUET
+# ============================================================================
+
+class ParquetArchiver:
+    """
+    Grava em disco (Parquet, append-only) todas as amostras de uma coleta.
+    
+    O buffer em memória guarda apenas as últimas CAPACIDADE_BUFFER amostras;
+    o arquivo mantém o histórico completo sem aumentar o uso de memória.
+    Um arquivo é criado por execução da thread de coleta.
+    
+    As amostras são acumuladas em uma lista e gravadas em lote (a cada
+    LOTE_ARQUIVO amostras ou INTERVALO_MAXIMO_ARQUIVO segundos), evitando
+    montar uma tabela Arrow e um row group por amostra.
+    """
+    
+    ESQUEMA = pa.schema([
+        ('timestamp', pa.timestamp('ns', tz='UTC')),
+        ('rssi', pa.float32()),
+        ('desvio_movel', pa.float32()),
+        ('canal', pa.int16()),
+        ('frequencia', pa.string()),
+        ('evento', pa.string())
+    ])
+    
+    def __init__(self, diretorio=DIRETORIO_SESSOES):
+        """
+        Cria o arquivo da coleta no diretório de sessões.
+        
+        Args:
+            diretorio: Diretório onde os arquivos Parquet são gravados
+        """
+        os.makedirs(diretorio, exist_ok=True)
+        # Sufixo aleatório: coletas iniciadas no mesmo segundo (outra sessão
+        # ou reinício da thread) não sobrescrevem o arquivo uma da outra
+        self.caminho = os.path.join(
+            diretorio,
+            f"fading_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}.parquet"
+        )
+        self.writer = pq.ParquetWriter(self.caminho, self.ESQUEMA, compression='zstd')
+        self.pendentes = []
+        self.ultima_gravacao = time.monotonic()
+    
+    def write(self, timestamp, rssi, desvio_movel, canal, frequencia, evento):
+        """
+        Adiciona uma amostra ao lote, gravando o lote se estiver completo.
+        
+        Args:
+            timestamp: Horário da coleta (nanossegundos desde epoch)
+            rssi: Valor RSSI em dBm
+            desvio_movel: Desvio padrão móvel do RSSI
+            canal: Número do canal Wi-Fi, ou None
+            frequencia: Banda de frequência Wi-Fi
+            evento: Tipo de evento detectado, ou None
+        """
+        self.pendentes.append((timestamp, rssi, desvio_movel, canal, frequencia, evento))
+        if (len(self.pendentes) >= LOTE_ARQUIVO
+                or time.monotonic() - self.ultima_gravacao >= INTERVALO_MAXIMO_ARQUIVO):
+            self.flush()
+    
+    def flush(self):
+        """
+        Grava as amostras pendentes no arquivo, em uma única tabela.
+        
+        O lote é descartado mesmo se a gravação falhar, para que uma nova
+        tentativa (ex: em close) não repita o mesmo erro.
+        """
+        self.ultima_gravacao = time.monotonic()
+        if not self.pendentes:
+            return
+        
+        try:
+            colunas = zip(*self.pendentes)
+            tabela = pa.Table.from_pydict(
+                {campo.name: list(valores) for campo, valores in zip(self.ESQUEMA, colunas)},
+                schema=self.ESQUEMA
+            )
+            self.writer.write_table(tabela)
+        finally:
+            self.pendentes.clear()
+    
+    def close(self):
+        """Grava as amostras pendentes e finaliza o arquivo (rodapé do Parquet)."""
+        try:
+            self.flush()
+        finally:
+            self.writer.close()
+
+
+# ============================================================================
+# CLASSE: AMOSTRADOR EM SEGUNDO PLANO
+# ============================================================================
+
+def session_is_active(session_id):
+    """
+    Verifica se a sessão Streamlit dona da coleta ainda está conectada.
+    
+    Depende apenas da conexão do navegador, e não da frequência de
+    atualização da tela: uma aba em segundo plano (cujos timers o navegador
+    reduz) continua ativa e coletando.
+    
+    Args:
+        session_id: ID da sessão, ou None fora do runtime do Streamlit
+        
+    Retorna:
+        bool: False apenas se o runtime existe e a sessão foi encerrada
+    """
+    if session_id is None or not runtime.exists():
+        return True
+    return runtime.get_instance().is_active_session(session_id)
+
+
+@st.cache_resource
+def get_active_samplers():
+    """
+    Retorna o conjunto (compartilhado entre sessões) das coletas iniciadas.
+    
+    Criado uma única vez (cache_resource), junto com um hook atexit que
+    encerra as threads de coleta ao parar o servidor (Ctrl+C): como são
+    daemon, seriam interrompidas sem fechar o ParquetWriter, e o arquivo
+    ficaria sem rodapé (ilegível).
+    
+    Retorna:
+        weakref.WeakSet: Instâncias de WiFiSampler já iniciadas
+    """
+    amostradores = weakref.WeakSet()
+    atexit.register(stop_all_samplers, amostradores)
+    return amostradores
+
+
+def stop_all_samplers(amostradores):
+    """
+    Encerra as threads de coleta e aguarda o fechamento dos arquivos Parquet.
+    
+    Args:
+        amostradores: Conjunto retornado por get_active_samplers
+    """
+    amostradores = list(amostradores)
+    for amostrador in amostradores:
+        amostrador.stop()
+    for amostrador in amostradores:
+        thread = amostrador.thread
+        if thread is not None and thread.is_alive():
+            thread.join(ESPERA_ENCERRAMENTO)
+
+
+class WiFiSampler:
+    """
+    Coleta e processa amostras Wi-Fi em uma thread de fundo.
+    
+    A thread coleta no intervalo configurado, detecta fading, atualiza o
+    desvio padrão móvel e escreve cada amostra diretamente no buffer
+    (protegido por lock). A interface apenas lê o buffer e retira da fila
+    os eventos detectados, em uma cadência própria (INTERVALO_ATUALIZACAO_TELA),
+    independente da taxa de amostragem.
+    """
+    
+    def __init__(self, collector, buffer, session_id=None):
+        """
+        Inicializa o amostrador parado.
+        
+        Args:
+            collector: Instância de WiFiDataCollector usada nas coletas
+            buffer: RSSIRingBuffer onde as amostras são escritas
+            session_id: ID da sessão Streamlit; a thread encerra quando ela termina
+        """
+        self.collector = collector
+        self.buffer = buffer
+        self.session_id = session_id
+        self.fila_eventos = queue.Queue(maxsize=TAMANHO_FILA_EVENTOS)
+        self.intervalo = 0.5
+        self.parar = threading.Event()
+        self.thread = None
+        self.arquivo = None  # ParquetArchiver da execução atual da thread
+        self.erro_arquivo = None  # Última falha do arquivamento (exibida na interface)
+        self.reset_estado()
+    
+    def reset_estado(self):
+        """Reinicia a janela do detector e o desvio padrão móvel."""
+        self.janela_rssi = np.empty(JANELA_DETECCAO, dtype=np.float64)
+        self.janela_total = 0
+        self.desvio_movel = OnlineRollingStd()
+    
+    def start(self, intervalo):
+        """
+        Inicia a thread de coleta (se parada) e atualiza o intervalo.
+        
+        Args:
+            intervalo: Intervalo entre coletas em segundos
+        """
+        self.intervalo = intervalo
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.parar.clear()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+        # Fechada também ao encerrar o processo (atexit)
+        get_active_samplers().add(self)
+    
+    def stop(self):
+        """Sinaliza para a thread de coleta encerrar."""
+        self.parar.set()
+    
+    def clear(self):
+        """Descarta todas as amostras, eventos pendentes e o estado do detector."""
+        with self.buffer.lock:
+            self.buffer.clear()
+            self.reset_estado()
+            self.drain()
+    
+    def run(self):
+        """
+        Loop da thread de coleta.
+        
+        Encerra sozinho quando a sessão Streamlit termina (navegador fechado
+        ou desconectado); start() o reinicia se a sessão se reconectar. Cada execução grava suas amostras
+        em um novo arquivo Parquet, finalizado quando a thread encerra
+        (inclusive ao parar o servidor, via stop_all_samplers). Falhas
+        no arquivo apenas desativam o arquivamento; a coleta continua.
+        """
+        try:
+            self.arquivo = ParquetArchiver()
+            self.erro_arquivo = None
+        except (OSError, pa.ArrowException) as e:
+            self.disable_archive(e)
+        try:
+            while not self.parar.is_set():
+                if not session_is_active(self.session_id):
+                    return
+                wifi_info = self.collector.get_wifi_info()
+                if wifi_info and wifi_info['rssi'] is not None:
+                    self.process(time.time_ns(), wifi_info)
+                self.parar.wait(self.intervalo)
+        finally:
+            if self.arquivo is not None:
+                try:
+                    self.arquivo.close()
+                except (OSError, pa.ArrowException) as e:
+                    self.erro_arquivo = str(e)
+                self.arquivo = None
+    
+    def disable_archive(self, erro):
+        """
+        Desativa o arquivamento em Parquet após uma falha, mantendo a coleta.
+        
+        Args:
+            erro: Exceção que causou a falha
+        """
+        self.erro_arquivo = str(erro)
+        if self.arquivo is not None:
+            try:
+                self.arquivo.close()
+            except (OSError, pa.ArrowException):
+                pass
+            self.arquivo = None
+    
+    def process(self, timestamp, wifi_info):
+        """
+        Detecta fading na nova amostra e a escreve no buffer e no arquivo.
+        
+        Args:
+            timestamp: Horário da coleta (nanossegundos desde epoch)
+            wifi_info: Dicionário retornado por WiFiDataCollector.get_wifi_info
+        """
+        rssi = wifi_info['rssi']
+        
+        with self.buffer.lock:
+            # Detecta fading usando a janela de amostras anteriores
+            codigo = FadingDetector.classify(rssi, self.janela_rssi, self.janela_total)
+            
+            # Escreve nova amostra na janela circular
+            self.janela_rssi[self.janela_total % JANELA_DETECCAO] = rssi
+            self.janela_total += 1
+            
+            # Escreve novo ponto de dados no buffer (O(1), sem realocar)
+            desvio_movel = self.desvio_movel.update(rssi)
+            self.buffer.append(
+                timestamp,
+                rssi,
+                desvio_movel,
+                wifi_info['canal'],
+                wifi_info['frequencia'],
+                codigo
+            )
+            
+            # Avisa a interface sobre o evento (descartado se a fila estiver
+            # cheia; a amostra continua no buffer)
+            if codigo:
+                try:
+                    self.fila_eventos.put_nowait(
+                        (self.buffer.total - 1, EVENTOS_FADING[codigo], wifi_info)
+                    )
+                except queue.Full:
+                    pass
+        
+        # Histórico completo em disco (fora do lock: só esta thread usa o arquivo)
+        if self.arquivo is not None:
+            try:
+                self.arquivo.write(
+                    timestamp,
+                    rssi,
+                    desvio_movel,
+                    wifi_info['canal'],
+                    wifi_info['frequencia'],
+                    EVENTOS_FADING[codigo]
+                )
+            except (OSError, pa.ArrowException) as e:
+                self.disable_archive(e)
+    
+    def drain(self):
+        """
+        Retira todos os eventos detectados desde a última chamada.
+        
+        Retorna:
+            list: Tuplas (seq, evento, wifi_info) em ordem de detecção
+        """
+        eventos = []
+        while True:
+            try:
+                eventos.append(self.fila_eventos.get_nowait())
+            except queue.Empty:
+                return eventos
+
+
+def format_timestamp(timestamp_ns):
+    """
+    Formata um timestamp para exibição (HH:MM:SS, horário local).
+    
+    Args:
+        timestamp_ns: Timestamp em nanossegundos desde epoch
+        
+    Retorna:
+        str: Horário formatado
+    """
+    return datetime.fromtimestamp(timestamp_ns / 1e9).strftime("%H:%M:%S")
+
+
+def format_rssi_sequence(valores):
+    """
+    Formata uma sequência de RSSI para os prompts da IA (uma casa decimal).
+    
+    Args:
+        valores: Array NumPy com valores de RSSI em dBm
+        
+    Retorna:
+        str: Sequência no formato [-65.0, -64.5, ...]
+    """
+    return np.array2string(
+        valores,
+        precision=1,
+        floatmode='fixed',
+        separator=', ',
+        max_line_width=1_000_000  # Sem quebras de linha
+    )
+
+
+def timestamps_to_datetime(timestamps_ns):
+    """
+    Converte uma coluna de timestamps para datetime no horário local.
+    
+    Args:
+        timestamps_ns: Series com timestamps em nanossegundos desde epoch
+        
+    Retorna:
+        pd.Series: Datas e horários locais (sem fuso)
+    """
+    fuso_local = datetime.now().astimezone().tzinfo
+    return (
+        pd.to_datetime(timestamps_ns, unit='ns', utc=True)
+        .dt.tz_convert(fuso_local)
+        .dt.tz_localize(None)
+    )
+
+
+def indices_minmax(valores, max_pontos=PONTOS_GRAFICO):
+    """
+    Seleciona os índices a plotar de uma série longa (downsampling MinMax).
+    
+    A série inteira é dividida em max_pontos / 2 blocos contíguos e, de cada
+    bloco, são mantidos o menor e o maior valor. Picos e quedas de sinal continuam
+    visíveis, mas o navegador recebe no máximo ~max_pontos pontos.
+    
+    Args:
+        valores: Array NumPy com os valores da série
+        max_pontos: Número máximo de pontos desejado
+        
+    Retorna:
+        np.ndarray: Índices selecionados, em ordem crescente
+    """
+    total = len(valores)
+    if total <= max_pontos:
+        return np.arange(total)
+    
+    # Blocos de tamanhos quase iguais cobrindo a série inteira: os primeiros
+    # `resto` blocos têm uma amostra a mais, então nenhuma amostra fica de fora
+    num_blocos = max_pontos // 2
+    tamanho_bloco, resto = divmod(total, num_blocos)
+    divisao = resto * (tamanho_bloco + 1)
+    
+    indices = []
+    for inicio, fim, tamanho in (
+        (0, divisao, tamanho_bloco + 1),
+        (divisao, total, tamanho_bloco)
+    ):
+        if fim == inicio:
+            continue
+        blocos = valores[inicio:fim].reshape(-1, tamanho)
+        base = inicio + np.arange(len(blocos)) * tamanho
+        indices.append(base + blocos.argmin(axis=1))
+        indices.append(base + blocos.argmax(axis=1))
+    
+    indices = np.concatenate(indices)
+    return np.unique(indices)
 
 
 # ============================================================================
 # CLASSE: ANALISADOR COM IA
 # ============================================================================
 
+# Prompt da análise geral, montado uma única vez e preenchido via str.format
+PROMPT_ANALISE_FADING = """
+Atue como um Engenheiro de Telecomunicacoes especialista em Camada Fisica do modelo OSI.
+
+DADOS COLETADOS:
+- Sequencia de RSSI (dBm): {contexto}
+- Canal Wi-Fi: {canal}
+- Frequencia: {frequencia}
+- Evento Detectado: {evento}
+
+ANALISE SOLICITADA:
+1. Descreva o comportamento do sinal (estavel, oscilando, queda, subida).
+2. Explique o fenomeno fisico provavel:
+   - Multipercurso (reflexoes)
+   - Shadowing (obstaculos)
+   - Interferencia
+   - Movimento de pessoas/objetos
+3. Relacione com conceitos da camada fisica do modelo OSI.
+4. Sugira acoes de mitigacao (ex: mudar canal, reposicionar antena, trocar banda).
+
+Seja tecnico mas direto. Use no maximo 5 paragrafos curtos.
+"""
+
+# Prompt da análise de um evento específico, preenchido com os dados de build_event_data
+PROMPT_ANALISE_EVENTO = """
+Atue como um Engenheiro de Telecomunicacoes especialista em Camada Fisica do modelo OSI.
+
+EVENTO ESPECIFICO DETECTADO:
+- Tipo: {tipo_evento}
+- Horario: {timestamp}
+- RSSI no momento: {rssi_evento:.1f} dBm
+- Taxa de variacao: {taxa_variacao}
+- Canal Wi-Fi: {canal}
+- Frequencia: {frequencia}
+
+CONTEXTO (sequencia de RSSI antes e depois):
+{rssi_sequence}
+
+ANALISE SOLICITADA:
+1. Analise especificamente este evento de {tipo_evento}.
+2. Explique por que este tipo de fading ocorreu neste momento especifico.
+3. Considerando a taxa de variacao de {taxa_variacao}, qual a severidade?
+4. Relacione com fenomenos fisicos da camada OSI (multipercurso, shadowing, interferencia).
+5. Sugira acoes corretivas especificas para este tipo de problema.
+
+Seja tecnico e direto. Use no maximo 5 paragrafos curtos.
+"""
+
+@st.cache_resource
+def get_groq_client(api_key):
+    """
+    Cria o cliente Groq uma única vez por API Key.
+    
+    O cliente é mantido entre reruns (cache_resource), reaproveitando o
+    pool de conexões HTTP e evitando um novo handshake TLS a cada análise.
+    
+    Args:
+        api_key: Chave da API Groq
+        
+    Retorna:
+        Groq: Cliente da API Groq
+    """
+    return Groq(api_key=api_key)
+
+
 class AIAnalyzer:
     """Gerencia análise de eventos de fading usando IA (Groq LLM)."""
     
@@ -194,9 +1339,31 @@ class AIAnalyzer:
         self.api_key = api_key
         self.model = model
        
-        self.client = Groq(api_key=api_key) if api_key else None
+        self.client = get_groq_client(api_key) if api_key else None
+    
+    async def _complete(self, prompt):
+        """
+        Envia prompt para a API Groq sem bloquear o event loop.
+        
+        A chamada HTTP do cliente Groq é síncrona, então é executada
+        em uma thread separada via asyncio.to_thread.
+        
+        Args:
+            prompt: Texto do prompt a enviar
+            
+        Retorna:
+            str: Conteúdo da resposta gerada pela IA
+        """
+        chat_completion = await asyncio.to_thread(
+            self.client.chat.completions.create,
+            messages=[{"role": "user", "content": prompt}],
+            model=self.model,
+            temperature=0.6,
+            max_tokens=MAX_TOKENS_IA
+        )
+        return chat_completion.choices[0].message.content
     
-    def analyze_fading(self, contexto_rssi, evento, canal, frequencia):
+    async def analyze_fading(self, contexto_rssi, evento, canal, frequencia):
         """
         Gera análise de IA para um evento de fading.
         
@@ -206,7 +1373,7 @@ class AIAnalyzer:
         3. Retorna análise técnica gerada
         
         Args:
-            contexto_rssi: Lista com valores recentes de RSSI
+            contexto_rssi: Array NumPy com valores recentes de RSSI
             evento: Tipo de evento de fading detectado
             canal: Número do canal Wi-Fi
             frequencia: Banda de frequência Wi-Fi
@@ -220,40 +1387,162 @@ class AIAnalyzer:
         # Define foco da análise 
         evento_foco = evento if evento else "Analise de Tendencia"
         
-        # Monta prompt estruturado para a IA
-        prompt = f"""
-Atue como um Engenheiro de Telecomunicacoes especialista em Camada Fisica do modelo OSI.
-
-DADOS COLETADOS:
-- Sequencia de RSSI (dBm): {contexto_rssi}
-- Canal Wi-Fi: {canal if canal else 'Nao disponivel'}
-- Frequencia: {frequencia if frequencia else 'Nao disponivel'}
-- Evento Detectado: {evento_foco}
-
-ANALISE SOLICITADA:
-1. Descreva o comportamento do sinal (estavel, oscilando, queda, subida).
-2. Explique o fenomeno fisico provavel:
-   - Multipercurso (reflexoes)
-   - Shadowing (obstaculos)
-   - Interferencia
-   - Movimento de pessoas/objetos
-3. Relacione com conceitos da camada fisica do modelo OSI.
-4. Sugira acoes de mitigacao (ex: mudar canal, reposicionar antena, trocar banda).
-
-Seja tecnico mas direto. Use no maximo 5 paragrafos curtos.
-"""
+        # Monta prompt a partir do template, com apenas as últimas amostras
+        prompt = PROMPT_ANALISE_FADING.format(
+            contexto=format_rssi_sequence(contexto_rssi[-CONTEXTO_IA_AMOSTRAS:]),
+            canal=canal if canal else 'Nao disponivel',
+            frequencia=frequencia if frequencia else 'Nao disponivel',
+            evento=evento_foco
+        )
         
         try:
-            # Envia requisição para API Groq
-            chat_completion = self.client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model=self.model,
-                temperature=0.6 
-            )
-            # Retorna conteúdo da resposta
-            return chat_completion.choices[0].message.content
+            return await self._complete(prompt)
         except Exception as e:
             return f"Erro na IA: {e}"
+    
+    async def analyze_event(self, evento_data):
+        """
+        Gera análise de IA para um evento específico do histórico.
+        
+        Args:
+            evento_data: Dicionário com tipo_evento, timestamp, rssi_evento,
+                taxa_variacao, canal, frequencia e rssi_sequence
+            
+        Retorna:
+            str: Relatório de análise gerado pela IA
+        """
+        if not self.client:
+            raise RuntimeError("API Key ausente.")
+        
+        # Preenche o prompt específico para análise deste evento
+        prompt = PROMPT_ANALISE_EVENTO.format(**evento_data)
+        
+        return await self._complete(prompt)
+    
+    async def explain_all(self, eventos_data):
+        """
+        Analisa vários eventos em paralelo.
+        
+        As requisições são disparadas juntas com asyncio.gather, então o
+        tempo total é o da chamada mais lenta, e não a soma de todas.
+        
+        Args:
+            eventos_data: Lista de dicionários no formato de analyze_event
+            
+        Retorna:
+            list: Relatório (str) ou exceção de cada evento, na mesma ordem
+        """
+        return await asyncio.gather(
+            *(self.analyze_event(evento_data) for evento_data in eventos_data),
+            return_exceptions=True
+        )
+
+
+@st.cache_resource
+def get_analyzer(api_key, model):
+    """
+    Cria o analisador de IA uma única vez por API Key e modelo.
+    
+    Args:
+        api_key: Chave da API Groq
+        model: Nome do modelo LLM a ser usado
+        
+    Retorna:
+        AIAnalyzer: Analisador compartilhado entre reruns e sessões
+    """
+    return AIAnalyzer(api_key, model)
+
+
+# ============================================================================
+# EXECUÇÃO ASSÍNCRONA
+# ============================================================================
+
+@st.cache_resource
+def get_event_loop():
+    """
+    Cria um event loop asyncio rodando em thread de fundo.
+    
+    O loop é criado uma única vez (cache_resource) e compartilhado entre
+    reruns, permitindo que chamadas à IA continuem enquanto o script do
+    Streamlit segue coletando amostras.
+    
+    Retorna:
+        asyncio.AbstractEventLoop: Event loop em execução
+    """
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return loop
+
+
+def run_async(coro):
+    """
+    Agenda uma corrotina no event loop de fundo.
+    
+    Args:
+        coro: Corrotina a executar
+        
+    Retorna:
+        concurrent.futures.Future: Futuro com o resultado da corrotina
+    """
+    return asyncio.run_coroutine_threadsafe(coro, get_event_loop())
+
+
+def collect_report(chave):
+    """
+    Armazena na sessão o relatório do futuro em st.session_state[chave], se concluído.
+    
+    Args:
+        chave: 'relatorio_pendente' (automático) ou 'relatorio_solicitado' (pedido pelo usuário)
+        
+    Retorna:
+        bool: True se um novo relatório foi armazenado na sessão
+    """
+    futuro = st.session_state[chave]
+    if futuro is None or not futuro.done():
+        return False
+    
+    try:
+        st.session_state.ultimo_relatorio = futuro.result()
+    except Exception as e:
+        st.session_state.ultimo_relatorio = f"Erro ao gerar relatorio: {e}"
+    st.session_state[chave] = None
+    return True
+
+
+def check_pending_report():
+    """
+    Verifica se os relatórios em geração em segundo plano já foram concluídos.
+    
+    O relatório pedido pelo usuário é recolhido por último, para prevalecer
+    sobre um automático concluído ao mesmo tempo.
+    
+    Retorna:
+        bool: True se um novo relatório automático foi armazenado na sessão
+    """
+    automatico = collect_report('relatorio_pendente')
+    collect_report('relatorio_solicitado')
+    return automatico
+
+
+def report_in_progress():
+    """Indica se há relatório (automático ou pedido pelo usuário) em geração."""
+    return (st.session_state.relatorio_pendente is not None
+            or st.session_state.relatorio_solicitado is not None)
+
+
+def request_report(coro):
+    """
+    Dispara em segundo plano um relatório pedido pelo usuário.
+    
+    Fica em um futuro próprio (relatorio_solicitado), para não ser
+    substituído pelo relatório automático de um evento detectado enquanto
+    é gerado; um relatório automático ainda em andamento é descartado.
+    
+    Args:
+        coro: Corrotina do AIAnalyzer que gera o relatório
+    """
+    st.session_state.relatorio_pendente = None
+    st.session_state.relatorio_solicitado = run_async(coro)
 
 
 # ============================================================================
@@ -267,11 +1556,9 @@ def initialize_session_state():
     Session state mantém dados entre reruns do Streamlit.
     Funciona como variáveis globais persistentes.
     """
-    # DataFrame para armazenar todos os dados coletados
-    if 'data' not in st.session_state:
-        st.session_state.data = pd.DataFrame(
-            columns=['timestamp', 'rssi', 'canal', 'frequencia', 'evento']
-        )
+    # Buffer circular para armazenar os dados coletados
+    if 'buffer' not in st.session_state:
+        st.session_state.buffer = RSSIRingBuffer()
     
     # Flag indicando se monitoramento está ativo
     if 'monitoring' not in st.session_state:
@@ -284,6 +1571,31 @@ def initialize_session_state():
     # Intervalo entre coletas em segundos
     if 'intervalo_coleta' not in st.session_state:
         st.session_state.intervalo_coleta = 0.5
+    
+    # Relatório automático em geração em segundo plano (concurrent.futures.Future)
+    if 'relatorio_pendente' not in st.session_state:
+        st.session_state.relatorio_pendente = None
+    
+    # Relatório pedido pelo usuário em geração em segundo plano
+    if 'relatorio_solicitado' not in st.session_state:
+        st.session_state.relatorio_solicitado = None
+    
+    # Números sequenciais dos eventos mais recentes (mais novo primeiro)
+    if 'eventos_recentes' not in st.session_state:
+        st.session_state.eventos_recentes = deque(maxlen=HISTORICO_EVENTOS)
+    
+    # Nome do arquivo de exportação, calculado uma vez no início da sessão
+    if 'nome_exportacao' not in st.session_state:
+        st.session_state.nome_exportacao = f"fading_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    
+    # Thread de coleta e detecção em segundo plano (escreve no buffer)
+    if 'sampler' not in st.session_state:
+        ctx = get_script_run_ctx()
+        st.session_state.sampler = WiFiSampler(
+            get_collector(),
+            st.session_state.buffer,
+            ctx.session_id if ctx else None
+        )
 
 
 def render_sidebar():
@@ -318,75 +1630,191 @@ def render_sidebar():
         
         # Botão para limpar todos os dados coletados
         if st.button("Limpar Todos os Dados", use_container_width=True):
-            # Reinicia DataFrame e relatório
-            st.session_state.data = pd.DataFrame(
-                columns=['timestamp', 'rssi', 'canal', 'frequencia', 'evento']
-            )
+            # Reinicia buffer, detector, eventos pendentes e relatório
+            st.session_state.sampler.clear()
+            st.session_state.eventos_recentes.clear()
             st.session_state.ultimo_relatorio = ""
+            st.session_state.relatorio_pendente = None
+            st.session_state.relatorio_solicitado = None
             st.rerun()  # Recarrega a página
         
-        # Botão de exportação 
-        if not st.session_state.data.empty:
-            st.divider()
-            # Converte DataFrame para CSV
-            csv = st.session_state.data.to_csv(index=False)
-            # Botão de download
-            st.download_button(
-                label="Exportar Dados (CSV)",
-                data=csv,
-                file_name=f"fading_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                mime="text/csv",
-                use_container_width=True
-            )
+        # Botão para analisar os eventos recentes em paralelo
+        # (sempre habilitado: a barra lateral não é redesenhada pelos fragmentos
+        # quando novos eventos chegam)
+        if st.button("Analisar Eventos Recentes", use_container_width=True):
+            analyze_recent_events()
+        
+        # Botão de exportação (sempre visível, pelo mesmo motivo)
+        st.divider()
+        # Botão de download: o CSV só é gerado quando o botão é clicado
+        buffer = st.session_state.buffer
+        st.download_button(
+            label="Exportar Dados (CSV)",
+            data=lambda: export_csv(buffer),
+            file_name=f"{st.session_state.nome_exportacao}.csv",
+            mime="text/csv",
+            use_container_width=True
+        )
+        # Exportação binária em colunas (menor e mais rápida que o CSV)
+        st.download_button(
+            label="Exportar Dados (Parquet)",
+            data=lambda: export_parquet(buffer),
+            file_name=f"{st.session_state.nome_exportacao}.parquet",
+            mime="application/octet-stream",
+            use_container_width=True
+        )
+
+
+def export_csv(buffer):
+    """
+    Converte as amostras do buffer para CSV (timestamps como data/hora).
+    
+    Args:
+        buffer: RSSIRingBuffer com as amostras da sessão
+        
+    Retorna:
+        bytes: Conteúdo do arquivo CSV em UTF-8
+    """
+    export_df = buffer.to_dataframe()
+    export_df['timestamp'] = timestamps_to_datetime(export_df['timestamp'])
+    return export_df.to_csv(index=False).encode('utf-8')
+
+
+def export_parquet(buffer):
+    """
+    Converte as amostras do buffer para Parquet (pyarrow, compressão zstd).
+    
+    Mantém os tipos das colunas (float32, Int16 e categóricas), ao contrário
+    do CSV, que converte tudo para texto.
+    
+    Args:
+        buffer: RSSIRingBuffer com as amostras da sessão
+        
+    Retorna:
+        bytes: Conteúdo do arquivo Parquet
+    """
+    export_df = buffer.to_dataframe()
+    export_df['timestamp'] = timestamps_to_datetime(export_df['timestamp'])
+    return export_df.to_parquet(engine='pyarrow', compression='zstd', index=False)
+
+
+def build_rssi_figure():
+    """
+    Cria a figura do gráfico principal de RSSI, ainda sem dados.
+    
+    A figura é criada uma vez por sessão; a cada coleta apenas os dados
+    dos traces são substituídos, sem reconstruir traces e layout.
+    
+    Retorna:
+        go.Figure: Figura com traces de RSSI e de eventos vazios
+    """
+    fig = go.Figure()
+    
+    # Linha principal do RSSI
+    fig.add_trace(go.Scattergl(
+        x=[],
+        y=[],
+        mode='lines+markers', 
+        name='RSSI',
+        line=dict(color='#1f77b4', width=2),
+        marker=dict(size=4)
+    ))
+    
+    # Marcadores vermelhos para eventos de fading
+    fig.add_trace(go.Scattergl(
+        x=[],
+        y=[],
+        mode='markers',
+        name='Eventos de Fading',
+        marker=dict(size=10, color='red', symbol='x') 
+    ))
+    
+    # Configurações do layout do gráfico
+    fig.update_layout(**LAYOUT_RSSI)
+    
+    return fig
+
+
+def build_stability_figure():
+    """
+    Cria a figura do gráfico de estabilidade (desvio padrão móvel), sem dados.
+    
+    Retorna:
+        go.Figure: Figura com o trace de desvio padrão vazio
+    """
+    fig = go.Figure()
+    fig.add_trace(go.Scattergl(
+        x=[],
+        y=[],
+        mode='lines',
+        name='Desvio Padrao Movel',
+        line=dict(color='#ff7f0e', width=2),
+        fill='tozeroy', 
+        fillcolor='rgba(255, 127, 14, 0.2)'
+    ))
+    fig.update_layout(**LAYOUT_ESTABILIDADE)
+    
+    return fig
+
+
+def build_timeline_figure():
+    """
+    Cria a figura da linha do tempo de eventos, sem dados.
+    
+    Há um trace fixo por tipo de evento (na ordem de EVENTOS_FADING),
+    identificado pelo nome do evento.
+    
+    Retorna:
+        go.Figure: Figura com um trace vazio por tipo de evento
+    """
+    fig = go.Figure()
+    for evento_tipo in EVENTOS_FADING[1:]:
+        fig.add_trace(go.Scattergl(
+            x=[],
+            y=[],
+            mode='markers',
+            name=evento_tipo,
+            marker=dict(size=12, color=CORES_EVENTOS[evento_tipo])
+        ))
+    fig.update_layout(**LAYOUT_LINHA_TEMPO)
+    
+    return fig
 
 
 def render_realtime_chart():
     """Renderiza gráfico de RSSI em tempo real e visualizações adicionais."""
     st.subheader("Monitoramento em Tempo Real")
     
-    if not st.session_state.data.empty:
+    data = st.session_state.buffer.to_dataframe()
+    
+    if not data.empty:
         # ====================================================================
         # GRÁFICO PRINCIPAL: RSSI EM TEMPO REAL
         # ====================================================================
         
-        fig = go.Figure()
+        # Figura persistente da sessão: apenas os dados são atualizados, e a
+        # key fixa em st.plotly_chart mantém o mesmo gráfico no navegador
+        if 'fig_rssi' not in st.session_state:
+            st.session_state.fig_rssi = build_rssi_figure()
+        fig = st.session_state.fig_rssi
         
-        # Cria cópia do DataFrame e adiciona índice numérico para eixo X
-        df = st.session_state.data.copy()
-        df['timestamp_num'] = range(len(df))
+        # Visões NumPy das colunas (sem cópia) e índice numérico para eixo X
+        rssi = data['rssi'].to_numpy()
+        timestamp_num = np.arange(len(data))
         
-        # Adiciona linha principal do RSSI
-        fig.add_trace(go.Scatter(
-            x=df['timestamp_num'],
-            y=df['rssi'],
-            mode='lines+markers', 
-            name='RSSI',
-            line=dict(color='#1f77b4', width=2),
-            marker=dict(size=4)
-        ))
+        # Atualiza linha principal do RSSI (reduzida a no máximo PONTOS_GRAFICO pontos)
+        indices = indices_minmax(rssi)
+        fig.data[0].update(x=timestamp_num[indices], y=rssi[indices])
         
-        # Destaca eventos de fading com marcadores vermelhos
-        eventos_df = df[df['evento'].notna()]  
-        if not eventos_df.empty:
-            fig.add_trace(go.Scatter(
-                x=eventos_df['timestamp_num'],
-                y=eventos_df['rssi'],
-                mode='markers',
-                name='Eventos de Fading',
-                marker=dict(size=10, color='red', symbol='x') 
-            ))
-        
-        # Configurações do layout do gráfico
-        fig.update_layout(
-            xaxis_title="Tempo",
-            yaxis_title="RSSI (dBm)",
-            height=400,
-            hovermode='x unified',  
-            showlegend=True,
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+        # Atualiza marcadores de eventos (legenda só aparece se houver eventos)
+        posicoes_eventos = st.session_state.buffer.event_positions(data.index)
+        fig.data[1].update(
+            x=timestamp_num[posicoes_eventos],
+            y=rssi[posicoes_eventos],
+            showlegend=len(posicoes_eventos) > 0
         )
         
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(fig, use_container_width=True, key='grafico_rssi')
         
         # ====================================================================
         # MÉTRICAS PRINCIPAIS
@@ -394,17 +1822,16 @@ def render_realtime_chart():
         
         col1, col2, col3, col4, col5, col6 = st.columns(6)
         
-        # Calcula métricas
-        atual = st.session_state.data.iloc[-1]['rssi']  # Última amostra
-        media = st.session_state.data['rssi'].mean()    # Média de todas
-        eventos_count = st.session_state.data['evento'].notna().sum()  # Total de eventos
-        canal = st.session_state.data.iloc[-1]['canal']
-        frequencia = st.session_state.data.iloc[-1]['frequencia']        
+        # Calcula métricas (última amostra e soma mantidas pelo buffer, O(1))
+        ultima, media = st.session_state.buffer.summary()
+        eventos_count = len(posicoes_eventos)  # Total de eventos
+        canal = ultima['canal']
+        frequencia = ultima['frequencia']
         # Exibe métricas em cards
-        col1.metric("Sinal Atual", f"{atual:.1f} dBm")
+        col1.metric("Sinal Atual", f"{ultima['rssi']:.1f} dBm")
         col2.metric("Media", f"{media:.1f} dBm")
-        col3.metric("Canal", f"{canal if pd.notna(canal) else 'N/A'}")
-        col5.metric("Frequencia", f"{frequencia if pd.notna(frequencia) else 'N/A'}")
+        col3.metric("Canal", f"{canal if canal is not None else 'N/A'}")
+        col5.metric("Frequencia", f"{frequencia if frequencia is not None else 'N/A'}")
         col6.metric("Eventos", eventos_count)
         
         st.divider()
@@ -418,31 +1845,21 @@ def render_realtime_chart():
         # GRÁFICO ESQUERDO: Estabilidade do Sinal
         with col_left:
             st.subheader("Estabilidade do Sinal")
-            if len(st.session_state.data) > 10:
+            if len(data) > 10:
                 # Mostra como a estabilidade varia ao longo do tempo
-                df_stability = st.session_state.data.copy()
-                df_stability['rolling_std'] = df_stability['rssi'].rolling(window=10, min_periods=1).std()
-                df_stability['timestamp_num'] = range(len(df_stability))
-                
-                fig_stability = go.Figure()
-                fig_stability.add_trace(go.Scatter(
-                    x=df_stability['timestamp_num'],
-                    y=df_stability['rolling_std'],
-                    mode='lines',
-                    name='Desvio Padrao Movel',
-                    line=dict(color='#ff7f0e', width=2),
-                    fill='tozeroy', 
-                    fillcolor='rgba(255, 127, 14, 0.2)'
-                ))
+                # Desvio padrão móvel já calculado na coleta (OnlineRollingStd)
+                rolling_std = data['desvio_movel'].to_numpy()
+                indices = indices_minmax(rolling_std)
                 
-                fig_stability.update_layout(
-                    xaxis_title="Tempo",
-                    yaxis_title="Desvio Padrao (dBm)",
-                    height=300,
-                    showlegend=False
+                if 'fig_stability' not in st.session_state:
+                    st.session_state.fig_stability = build_stability_figure()
+                fig_stability = st.session_state.fig_stability
+                fig_stability.data[0].update(
+                    x=timestamp_num[indices],
+                    y=rolling_std[indices]
                 )
                 
-                st.plotly_chart(fig_stability, use_container_width=True)
+                st.plotly_chart(fig_stability, use_container_width=True, key='grafico_estabilidade')
                 st.caption("Quanto maior o desvio, mais instavel esta o sinal")
             else:
                 st.info("Coletando dados... (minimo 10 amostras)")
@@ -450,39 +1867,31 @@ def render_realtime_chart():
         # GRÁFICO DIREITO: Distribuição de Qualidade
         with col_right:
             st.subheader("Distribuicao de Qualidade")
-            if len(st.session_state.data) > 5:
-                df_quality = st.session_state.data.copy()
-                
-                # Função para categorizar RSSI em níveis de qualidade
-                def categorize_rssi(rssi):
-                    if rssi >= -50:
-                        return "Excelente" 
-                    elif rssi >= -60:
-                        return "Bom"      
-                    elif rssi >= -70:
-                        return "Regular"   
-                    else:
-                        return "Fraco"    
+            if len(data) > 5:
+                # Categoriza RSSI em níveis de qualidade (vetorizado):
+                # < -70 Fraco, [-70, -60) Regular, [-60, -50) Bom, >= -50 Excelente
+                qualidade = pd.cut(
+                    rssi,
+                    bins=[-np.inf, -70, -60, -50, np.inf],
+                    labels=['Fraco', 'Regular', 'Bom', 'Excelente'],
+                    right=False
+                )
                 
-                # Aplica categorização e conta ocorrências
-                df_quality['qualidade'] = df_quality['rssi'].apply(categorize_rssi)
-                quality_counts = df_quality['qualidade'].value_counts()
+                # Conta ocorrências
+                quality_counts = qualidade.value_counts()
+                quality_counts = quality_counts[quality_counts > 0]  # Só níveis presentes
                 
                 # Cria gráfico de pizza 
                 fig_quality = go.Figure(data=[go.Pie(
                     labels=quality_counts.index,
                     values=quality_counts.values,
                     hole=0.4,  
-                    marker=dict(colors=['#2ecc71', '#3498db', '#f39c12', '#e74c3c'])
+                    marker=dict(colors=[CORES_QUALIDADE[q] for q in quality_counts.index])
                 )])
                 
-                fig_quality.update_layout(
-                    height=300,
-                    showlegend=True,
-                    legend=dict(orientation="h", yanchor="bottom", y=-0.2, xanchor="center", x=0.5)
-                )
+                fig_quality.update_layout(**LAYOUT_QUALIDADE)
                 
-                st.plotly_chart(fig_quality, use_container_width=True)
+                st.plotly_chart(fig_quality, use_container_width=True, key='grafico_qualidade')
                 st.caption("Distribuicao percentual da qualidade do sinal")
             else:
                 st.info("Coletando dados... (minimo 5 amostras)")
@@ -495,41 +1904,25 @@ def render_realtime_chart():
             st.divider()
             st.subheader("Linha do Tempo de Eventos")
             
-            eventos_df = st.session_state.data[st.session_state.data['evento'].notna()].copy()
-            eventos_df['timestamp_num'] = range(len(eventos_df))
+            eventos_df = data.iloc[posicoes_eventos]
             
-            # Mapeia cada tipo de evento para uma cor
-            event_colors = {
-                'Fast Fading': '#e74c3c',               # Vermelho
-                'Slow Fading / Shadowing': '#f39c12',   # Laranja
-                'Multipath Fading': '#9b59b6',          # Roxo
-                'Variacao Moderada': '#3498db'          # Azul
-            }
+            if 'fig_timeline' not in st.session_state:
+                st.session_state.fig_timeline = build_timeline_figure()
+            fig_timeline = st.session_state.fig_timeline
             
-            eventos_df['color'] = eventos_df['evento'].map(event_colors)
-            
-            fig_timeline = go.Figure()
-            
-            # Adiciona uma série para cada tipo de evento
-            for evento_tipo in eventos_df['evento'].unique():
-                df_evento = eventos_df[eventos_df['evento'] == evento_tipo]
-                fig_timeline.add_trace(go.Scatter(
-                    x=df_evento.index,
-                    y=[evento_tipo] * len(df_evento),
-                    mode='markers',
-                    name=evento_tipo,
-                    marker=dict(size=12, color=event_colors.get(evento_tipo, '#95a5a6'))
-                ))
-            
-            fig_timeline.update_layout(
-                xaxis_title="Amostra",
-                yaxis_title="Tipo de Evento",
-                height=250,
-                showlegend=True,
-                legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-            )
+            # Agrupa os eventos por tipo em uma única passada pela coluna
+            grupos = eventos_df.groupby('evento', sort=False, observed=True).indices
+            
+            # Atualiza a série de cada tipo de evento (legenda só para tipos presentes)
+            for trace in fig_timeline.data:
+                posicoes = grupos.get(trace.name, np.empty(0, dtype=np.intp))
+                trace.update(
+                    x=eventos_df.index[posicoes],
+                    y=[trace.name] * len(posicoes),
+                    showlegend=len(posicoes) > 0
+                )
             
-            st.plotly_chart(fig_timeline, use_container_width=True)
+            st.plotly_chart(fig_timeline, use_container_width=True, key='grafico_linha_tempo')
             st.caption("Distribuicao temporal dos eventos detectados")
     else:
         st.info("Clique em 'Iniciar / Pausar Monitoramento' no menu lateral para comecar.")
@@ -539,163 +1932,206 @@ def render_event_history():
     """Renderiza lista histórica de eventos com opção de análise individual."""
     st.subheader("Historico de Eventos")
     
-    # Filtra apenas linhas que têm eventos detectados
-    eventos_detectados = st.session_state.data[st.session_state.data['evento'].notna()]
+    # Busca os últimos 15 eventos (já do mais novo para o mais antigo),
+    # ignorando amostras já descartadas do buffer
+    eventos_recentes = st.session_state.buffer.rows(st.session_state.eventos_recentes)
     
-    if not eventos_detectados.empty:
-        st.caption("Clique em 'Analisar' para gerar um relatorio de IA especifico para aquele evento")
-        st.divider()
+    if not eventos_recentes.empty:
+        st.caption("Selecione um evento na tabela para gerar um relatorio de IA especifico para ele")
         
-        # Pega últimos 15 eventos e inverte ordem 
-        eventos_recentes = eventos_detectados.tail(15).iloc[::-1]
+        # Números sequenciais das linhas exibidas, usados ao tratar a seleção
+        st.session_state.eventos_exibidos = eventos_recentes.index.tolist()
         
-        for idx, row in eventos_recentes.iterrows():
-            # Container para cada evento
-            with st.container():
-                col1, col2, col3, col4, col5 = st.columns([2, 2, 2, 2, 1])
-                
-                with col1:
-                    st.text(f"{row['timestamp']}")
-                
-                with col2:
-                 
-                    st.text(f"{row['evento']}")
-                
-                with col3:
-                    st.text(f"RSSI: {row['rssi']:.1f} dBm")
-                
-                with col4:
-                    canal_info = f"Canal {row['canal']}" if pd.notna(row['canal']) else "N/A"
-                    st.text(f"{canal_info} | {row['frequencia']}")
-                
-                with col5:
-                    # Botão para analisar evento específico
-                  
-                    if st.button("Analisar", key=f"analyze_{idx}", type="secondary", use_container_width=True):
-                        analyze_specific_event(idx, row)
-                
-                st.divider()
+        # Tabela única (renderizada no navegador) em vez de widgets por linha
+        tabela = pd.DataFrame({
+            'Horario': [format_timestamp(ts) for ts in eventos_recentes['timestamp']],
+            'Evento': eventos_recentes['evento'].to_numpy(),
+            'RSSI (dBm)': eventos_recentes['rssi'].round(1).to_numpy(),
+            'Canal': eventos_recentes['canal'].array,  # Int16 anulável
+            'Frequencia': eventos_recentes['frequencia'].to_numpy()
+        })
+        
+        st.dataframe(
+            tabela,
+            hide_index=True,
+            use_container_width=True,
+            on_select=on_event_selected,
+            selection_mode='single-row',
+            key='tabela_eventos'
+        )
+        
+        # Análise disparada pela seleção: recarrega a página para a aba de
+        # análise passar a se atualizar enquanto o relatório é gerado
+        if st.session_state.pop('analise_disparada', False):
+            st.rerun()
     else:
         st.info("Nenhum evento detectado ainda.")
 
 
-def analyze_specific_event(event_idx, event_row):
+def on_event_selected():
     """
-    Analisa um evento específico enviando dados detalhados para a IA.
+    Callback da seleção na tabela de eventos: analisa o evento selecionado.
+    
+    Executado apenas quando a seleção muda, então a análise não é
+    disparada novamente nos reruns seguintes.
+    """
+    linhas = st.session_state.tabela_eventos.selection.rows
+    if not linhas:
+        return
+    
+    seq = st.session_state.eventos_exibidos[linhas[0]]
+    evento = st.session_state.buffer.rows([seq])
+    if not evento.empty:
+        analyze_specific_event(seq, evento.loc[seq])
+        st.session_state.analise_disparada = True
+
+
+def build_event_data(event_idx, event_row):
+    """
+    Monta os dados estruturados de um evento para análise pela IA.
     
     Funcionamento:
     1. Busca contexto (5 amostras antes e depois do evento)
     2. Calcula taxa de variação em dBm/s
-    3. Monta dados estruturados do evento
-    4. Cria prompt específico para a IA
-    5. Gera e exibe relatório detalhado
+    3. Monta dicionário com os dados do evento
     
     Args:
-        event_idx: Índice do evento no DataFrame
+        event_idx: Número sequencial da amostra do evento (índice do DataFrame)
         event_row: Linha do DataFrame contendo os dados do evento
-    """
-    with st.spinner(f"Analisando evento {event_row['evento']}..."):
-        # Busca contexto: 5 amostras antes e 5 depois do evento
-        start_idx = max(0, event_idx - 5)
-        end_idx = min(len(st.session_state.data), event_idx + 6)
-        
-        contexto_df = st.session_state.data.iloc[start_idx:end_idx]
-        contexto_rssi = contexto_df['rssi'].tolist()
-        
-        # Calcula taxa de variação (dBm/s)
-        # Mostra quão rápido o sinal mudou
-        if event_idx > 0:
-            rssi_anterior = st.session_state.data.iloc[event_idx - 1]['rssi']
-            variacao = abs(event_row['rssi'] - rssi_anterior)
-            # Divide pelo intervalo de coleta para obter taxa por segundo
-            taxa_variacao = variacao / st.session_state.intervalo_coleta
-        else:
-            taxa_variacao = 0
-        
-        evento_data = {
-            "rssi_sequence": contexto_rssi,
-            "rssi_evento": event_row['rssi'],
-            "timestamp": event_row['timestamp'],
-            "canal": event_row['canal'] if pd.notna(event_row['canal']) else "N/A",
-            "frequencia": event_row['frequencia'] if pd.notna(event_row['frequencia']) else "N/A",
-            "tipo_evento": event_row['evento'],
-            "taxa_variacao": f"{taxa_variacao:.1f} dBm/s"
-        }
         
-        # Cria prompt específico para análise deste evento
-        prompt = f"""
-Atue como um Engenheiro de Telecomunicacoes especialista em Camada Fisica do modelo OSI.
+    Retorna:
+        dict: Dados do evento no formato esperado por AIAnalyzer.analyze_event
+    """
+    # Busca contexto: 5 amostras antes e 5 depois do evento
+    # (índice = número sequencial da amostra; rows() ignora amostras descartadas)
+    contexto_df = st.session_state.buffer.rows(range(event_idx - 5, event_idx + 6))
+    contexto_rssi = format_rssi_sequence(contexto_df['rssi'].to_numpy())
+    
+    # Calcula taxa de variação (dBm/s)
+    # Mostra quão rápido o sinal mudou
+    if event_idx - 1 in contexto_df.index:
+        rssi_anterior = contexto_df.loc[event_idx - 1, 'rssi']
+        variacao = abs(event_row['rssi'] - rssi_anterior)
+        # Divide pelo intervalo de coleta para obter taxa por segundo
+        taxa_variacao = variacao / st.session_state.intervalo_coleta
+    else:
+        taxa_variacao = 0
+    
+    return {
+        "rssi_sequence": contexto_rssi,
+        "rssi_evento": event_row['rssi'],
+        "timestamp": format_timestamp(event_row['timestamp']),
+        "canal": event_row['canal'] if pd.notna(event_row['canal']) else "N/A",
+        "frequencia": event_row['frequencia'] if pd.notna(event_row['frequencia']) else "N/A",
+        "tipo_evento": event_row['evento'],
+        "taxa_variacao": f"{taxa_variacao:.1f} dBm/s"
+    }
 
-EVENTO ESPECIFICO DETECTADO:
-- Tipo: {evento_data['tipo_evento']}
-- Horario: {evento_data['timestamp']}
-- RSSI no momento: {evento_data['rssi_evento']:.1f} dBm
-- Taxa de variacao: {evento_data['taxa_variacao']}
-- Canal Wi-Fi: {evento_data['canal']}
-- Frequencia: {evento_data['frequencia']}
 
-CONTEXTO (sequencia de RSSI antes e depois):
-{evento_data['rssi_sequence']}
+def analyze_specific_event(event_idx, event_row):
+    """
+    Analisa um evento específico enviando dados detalhados para a IA.
+    
+    Funcionamento:
+    1. Monta dados estruturados do evento (contexto e taxa de variação)
+    2. Dispara a geração do relatório em segundo plano, sem aguardar a resposta
+    3. O relatório aparece na aba Análise quando concluído
+    
+    Args:
+        event_idx: Número sequencial da amostra do evento (índice do DataFrame)
+        event_row: Linha do DataFrame contendo os dados do evento
+    """
+    evento_data = build_event_data(event_idx, event_row)
+    
+    analyzer = get_analyzer(GROQ_API_KEY, MODELO_AI)
+    request_report(analyzer.analyze_event(evento_data))
+    st.toast(f"Analisando evento {evento_data['tipo_evento']}... o relatorio aparecera na aba Analise", icon="⏳")
 
-ANALISE SOLICITADA:
-1. Analise especificamente este evento de {evento_data['tipo_evento']}.
-2. Explique por que este tipo de fading ocorreu neste momento especifico.
-3. Considerando a taxa de variacao de {evento_data['taxa_variacao']}, qual a severidade?
-4. Relacione com fenomenos fisicos da camada OSI (multipercurso, shadowing, interferencia).
-5. Sugira acoes corretivas especificas para este tipo de problema.
 
-Seja tecnico e direto. Use no maximo 5 paragrafos curtos.
-"""
-        
-        # Envia para a IA e processa resposta
-        analyzer = AIAnalyzer(GROQ_API_KEY, MODELO_AI)
+async def build_events_report(analyzer, eventos_data):
+    """
+    Analisa vários eventos em paralelo e junta os relatórios em um só texto.
+    
+    Args:
+        analyzer: Instância de AIAnalyzer
+        eventos_data: Lista de dicionários de eventos (build_event_data)
         
-        try:
-            chat_completion = analyzer.client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model=analyzer.model,
-                temperature=0.6
-            )
-            relatorio = chat_completion.choices[0].message.content
-            
-            st.session_state.ultimo_relatorio = relatorio
-            st.success(f"Relatorio gerado para evento: {evento_data['tipo_evento']}")
-            st.toast("Relatorio disponivel na aba Analise", icon="✅")
-            
-            st.markdown("### Relatorio do Evento")
-            st.markdown(relatorio)
-            
-        except Exception as e:
-            st.error(f"Erro ao gerar relatorio: {e}")
+    Retorna:
+        str: Relatório combinado em markdown, uma seção por evento
+    """
+    relatorios = await analyzer.explain_all(eventos_data)
+    
+    secoes = []
+    for evento_data, relatorio in zip(eventos_data, relatorios):
+        if isinstance(relatorio, Exception):
+            relatorio = f"Erro ao gerar relatorio: {relatorio}"
+        secoes.append(
+            f"### {evento_data['tipo_evento']} ({evento_data['timestamp']})\n\n{relatorio}"
+        )
+    
+    return "\n\n".join(secoes)
+
+
+def analyze_recent_events():
+    """
+    Analisa os eventos mais recentes em paralelo e junta os relatórios.
+    
+    Funcionamento:
+    1. Seleciona os últimos eventos ainda presentes no buffer
+    2. Monta os dados de cada evento
+    3. Dispara todas as análises ao mesmo tempo em segundo plano (build_events_report)
+    4. O relatório combinado aparece na aba Análise quando concluído
+    """
+    eventos = st.session_state.buffer.rows(st.session_state.eventos_recentes)
+    eventos = eventos.iloc[:EVENTOS_ANALISE_LOTE]
+    
+    if eventos.empty:
+        st.toast("Nenhum evento detectado ainda.", icon="ℹ️")
+        return
+    
+    eventos_data = [build_event_data(seq, linha) for seq, linha in eventos.iterrows()]
+    
+    analyzer = get_analyzer(GROQ_API_KEY, MODELO_AI)
+    request_report(build_events_report(analyzer, eventos_data))
+    st.toast(f"Analisando {len(eventos_data)} eventos em paralelo... o relatorio aparecera na aba Analise", icon="⏳")
 
 
 def render_ai_analysis():
     """Renderiza seção de análise com IA."""
     st.subheader("Relatorio com IA")
     
+    # Recolhe relatórios concluídos em segundo plano
+    check_pending_report()
+    
     col_btn, col_info = st.columns([1, 3])
     
     with col_btn:
-        tem_dados = not st.session_state.data.empty
+        tem_dados = len(st.session_state.buffer) > 0
         # Botão para gerar relatório 
         if st.button("Relatorio", disabled=not tem_dados, type="secondary"):
-            with st.spinner("Gerando relatorio..."):
-                # Pega últimas 40 amostras para contexto amplo
-                dados_recentes = st.session_state.data['rssi'].tail(40).tolist()
-                eventos_recentes = st.session_state.data['evento'].tail(40).dropna()
-                ultimo_evento = eventos_recentes.iloc[-1] if not eventos_recentes.empty else None
-                
-                # Pega canal e frequência mais recentes
-                canal = st.session_state.data.iloc[-1]['canal'] if not st.session_state.data.empty else None
-                frequencia = st.session_state.data.iloc[-1]['frequencia'] if not st.session_state.data.empty else None
-                
-                # Gera relatório geral
-                analyzer = AIAnalyzer(GROQ_API_KEY, MODELO_AI)
-                relatorio = analyzer.analyze_fading(dados_recentes, ultimo_evento, canal, frequencia)
-                st.session_state.ultimo_relatorio = relatorio
-                st.rerun()
+            # Pega últimas 40 amostras para contexto amplo
+            data = st.session_state.buffer.tail(CONTEXTO_IA_AMOSTRAS)
+            dados_recentes = data['rssi'].to_numpy()
+            posicoes_eventos = st.session_state.buffer.event_positions(data.index)
+            ultimo_evento = data['evento'].iat[posicoes_eventos[-1]] if len(posicoes_eventos) else None
+            
+            # Pega canal e frequência mais recentes
+            ultima = data.iloc[-1]
+            canal = ultima['canal'] if pd.notna(ultima['canal']) else None
+            frequencia = ultima['frequencia']
+            
+            # Dispara relatório geral em segundo plano, sem bloquear a interface
+            analyzer = get_analyzer(GROQ_API_KEY, MODELO_AI)
+            request_report(
+                analyzer.analyze_fading(dados_recentes, ultimo_evento, canal, frequencia)
+            )
+            # Recarrega a página para o fragmento passar a se atualizar
+            # enquanto o relatório é gerado
+            st.rerun()
     
     with col_info:
+        if report_in_progress():
+            st.info("Gerando relatorio em segundo plano...")
         if st.session_state.ultimo_relatorio:
             st.success("Relatorio Atualizado")
             st.markdown(st.session_state.ultimo_relatorio)
@@ -705,64 +2141,75 @@ def render_ai_analysis():
 
 def collect_and_process_data():
     """
-    Loop principal de coleta e processamento de dados.
+    Processa os eventos detectados pela thread de coleta.
     
     Funcionamento:
-    1. Verifica se monitoramento está ativo
-    2. Coleta dados Wi-Fi do sistema
-    3. Detecta eventos de fading
-    4. Armazena dados no DataFrame
-    5. Gera relatório automático se evento for detectado
-    6. Aguarda intervalo configurado e reinicia
+    1. Inicia ou para a thread de coleta conforme o estado do monitoramento
+    2. Retira da fila os eventos detectados desde a última execução
+       (a coleta, a detecção e a escrita no buffer ocorrem na thread)
+    3. Registra os eventos no histórico e notifica via toast
+    4. Dispara relatório automático em segundo plano se evento for detectado
+       (exceto enquanto outro relatório ainda é gerado)
+    
+    Retorna:
+        str: Último tipo de evento detectado, ou None se nenhum
     """
+    sampler = st.session_state.sampler
     if st.session_state.monitoring:
-        # Coleta dados Wi-Fi
-        collector = WiFiDataCollector()
-        wifi_info = collector.get_wifi_info()
-        
-        if wifi_info and wifi_info['rssi'] is not None:
-            # Gera timestamp atual
-            ts = datetime.now().strftime("%H:%M:%S")
-            
-            # Detecta fading usando histórico
-            detector = FadingDetector()
-            evento = detector.detect_fading(wifi_info['rssi'], st.session_state.data)
-            
-            # Cria novo ponto de dados
-            novo_df = pd.DataFrame({
-                'timestamp': [ts],
-                'rssi': [wifi_info['rssi']],
-                'canal': [wifi_info['canal']],
-                'frequencia': [wifi_info['frequencia']],
-                'evento': [evento]
-            })
-            
-            # Adiciona ao DataFrame principal
-            st.session_state.data = pd.concat(
-                [st.session_state.data, novo_df],
-                ignore_index=True
-            )
-            
-            # Se evento foi detectado, gera relatório automático
-            if evento:
-                st.toast(f"Evento detectado: {evento}", icon="⚠️")
-                
-                # Pega contexto para IA 
-                dados_para_ia = st.session_state.data['rssi'].tail(40).tolist()
-                analyzer = AIAnalyzer(GROQ_API_KEY, MODELO_AI)
-                relatorio_auto = analyzer.analyze_fading(
-                    dados_para_ia,
-                    evento,
-                    wifi_info['canal'],
-                    wifi_info['frequencia']
-                )
-                
-                st.session_state.ultimo_relatorio = relatorio_auto
-                st.toast("Relatorio Automatico Gerado", icon="📝")
-        
-        # Aguarda intervalo configurado antes da próxima coleta
-        time.sleep(st.session_state.intervalo_coleta)
-        st.rerun() 
+        sampler.start(st.session_state.intervalo_coleta)
+    else:
+        sampler.stop()
+    
+    ultimo_evento = None
+    
+    for seq, evento, wifi_info in sampler.drain():
+        # Registra no histórico
+        st.session_state.eventos_recentes.appendleft(seq)
+        st.toast(f"Evento detectado: {evento}", icon="⚠️")
+        ultimo_evento = evento
+        ultimo_info = wifi_info
+    
+    # Gera relatório automático para o último evento detectado; enquanto
+    # outro relatório é gerado, não dispara um novo (que substituiria o
+    # anterior antes de concluir, e nenhum relatório chegaria à tela)
+    if ultimo_evento and not report_in_progress():
+        # Pega contexto para IA e dispara análise sem aguardar resposta,
+        # para que a coleta continue durante a chamada à API
+        dados_para_ia = st.session_state.buffer.tail_rssi(CONTEXTO_IA_AMOSTRAS)
+        analyzer = get_analyzer(GROQ_API_KEY, MODELO_AI)
+        st.session_state.relatorio_pendente = run_async(analyzer.analyze_fading(
+            dados_para_ia,
+            ultimo_evento,
+            ultimo_info['canal'],
+            ultimo_info['frequencia']
+        ))
+    
+    return ultimo_evento
+
+
+def render_monitoring():
+    """
+    Renderiza a aba de monitoramento, processando novas amostras antes.
+    
+    Executada como fragmento (st.fragment): enquanto o monitoramento está
+    ativo, o Streamlit reexecuta apenas esta função a cada
+    INTERVALO_ATUALIZACAO_TELA segundos, sem reexecutar o script inteiro.
+    A coleta segue na própria cadência, na thread do WiFiSampler.
+    """
+    # Relatório concluído em segundo plano (as abas de análise e de eventos
+    # são fragmentos próprios e se atualizam sozinhas, sem recarregar a página);
+    # recolhido antes dos eventos novos, que só geram relatório sem outro pendente
+    if check_pending_report():
+        st.toast("Relatorio Automatico Gerado", icon="📝")
+    
+    collect_and_process_data()
+    
+    # Arquivamento em disco falhou: a coleta continua apenas em memória
+    erro_arquivo = st.session_state.sampler.erro_arquivo
+    if erro_arquivo:
+        st.warning(f"Historico em disco desativado (coleta continua em memoria): {erro_arquivo}")
+    
+    render_realtime_chart()
 
 
 def main():
@@ -779,20 +2226,25 @@ def main():
     # Cria abas principais da interface
     tab1, tab2, tab3 = st.tabs(["Monitoramento", "Analise", "Eventos"])
     
+    # Cada aba é um fragmento: reexecutado em cadência fixa enquanto
+    # monitorando (a taxa de amostragem é controlada pela thread de coleta),
+    # sem reexecutar o script inteiro
+    intervalo = INTERVALO_ATUALIZACAO_TELA if st.session_state.monitoring else None
+    
     # Aba 1: Monitoramento em tempo real
     with tab1:
-        render_realtime_chart()
+        st.fragment(run_every=intervalo)(render_monitoring)()
     
-    # Aba 2: Análise com IA
+    # Aba 2: Análise com IA (também se atualiza enquanto há relatório em geração)
+    intervalo_analise = intervalo
+    if report_in_progress():
+        intervalo_analise = INTERVALO_ATUALIZACAO_TELA
     with tab2:
-        render_ai_analysis()
+        st.fragment(run_every=intervalo_analise)(render_ai_analysis)()
     
     # Aba 3: Histórico de eventos
     with tab3:
-        render_event_history()
-    
-    # Loop de coleta de dados 
-    collect_and_process_data()
+        st.fragment(run_every=intervalo)(render_event_history)()
 
 
 # Ponto de entrada do script